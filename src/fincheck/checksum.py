@@ -1,5 +1,5 @@
 from typing import *
-from .utils import ensure_format, keep_numeric, convert_to_n
+from .utils import ensure_format, keep_numeric, convert_to_n, jit
 
 def luhn_check_digit(s: str) -> int:
     """
@@ -65,6 +65,64 @@ def cusip_check_digit(s: str) -> int:
     return (10 - (sum_ % 10)) % 10 
 
 
+@jit
+def cusip_check_digit_ascii(buf: bytes) -> int:
+    """
+    Same as cusip_check_digit, but works directly on the ascii codes of the payload so it can be JIT compiled
+    Returns -1 if the payload contains characters outside of 0-9 and A-Z
+    ------
+    PARAMS
+    ------
+        1. 'buf' -> ascii encoded payload
+    """
+    sum_ = 0
+    for idx in range(len(buf)):
+        c = buf[idx]
+        if 48 <= c <= 57: #0-9
+            digit = c - 48
+        elif 65 <= c <= 90: #A-Z -> 10-35
+            digit = c - 55
+        else:
+            return -1
+        if idx % 2 != 0:
+            digit *= 2
+        sum_ += digit // 10 + digit % 10
+    return (10 - (sum_ % 10)) % 10
+
+
+@jit
+def isin_check_digit_ascii(buf: bytes) -> int:
+    """
+    Same as isin_check_digit, but works directly on the ascii codes of the payload so it can be JIT compiled
+    Letters expand to two digits, and Luhn's algorithm doubles every other digit starting from the rightmost
+    Returns -1 if the payload contains characters outside of 0-9 and A-Z
+    ------
+    PARAMS
+    ------
+        1. 'buf' -> ascii encoded payload
+    """
+    sum_ = 0
+    double = True
+    for idx in range(len(buf) - 1, -1, -1):
+        c = buf[idx]
+        if 48 <= c <= 57: #0-9
+            n = c - 48
+            n_digits = 1
+        elif 65 <= c <= 90: #A-Z -> 10-35
+            n = c - 55
+            n_digits = 2
+        else:
+            return -1
+        for _ in range(n_digits): #ones first, as we are moving right to left
+            digit = n % 10
+            n //= 10
+            if double:
+                digit *= 2
+            sum_ += digit // 10 + digit % 10
+            double = not double
+    return (10 - (sum_ % 10)) % 10
+
+
 def sedol_check_digit(s: str) -> int:
     """
     Returns the Check Digit for a SEDOL
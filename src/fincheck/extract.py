@@ -1,6 +1,28 @@
 from .validate import is_cusip, is_isin, is_aba, is_sedol
-from .utils import find_and_validate
+from .utils import find_and_validate, iter_find_and_validate, find_and_validate_file, iter_matches, compile_pattern
 from typing import *
+import functools
+
+#compiled once at import rather than on every extraction call
+#\b is used as the word guard (instead of lookarounds) so the patterns are also valid RE2/PCRE JIT syntax
+_CUSIP_PATTERN = r"\b([A-Za-z0-9]{8}[0-9])\b" #ensure 9th is digit
+_ISIN_PATTERN = r"\b([A-Za-z]{2}[A-Za-z0-9]{9}[0-9])\b"
+_SEDOL_PATTERN = r"\b([0-9BCDFGHJKLMNPQRSTVWXYZ]{6}[0-9])\b"
+_ABA_PATTERN = r"\b(\d{9})\b"
+
+_CUSIP_RE = compile_pattern(_CUSIP_PATTERN)
+_ISIN_RE = compile_pattern(_ISIN_PATTERN)
+_SEDOL_RE = compile_pattern(_SEDOL_PATTERN)
+_ABA_RE = compile_pattern(_ABA_PATTERN)
+
+#CUSIPs, ISINs, and SEDOLs differ in length, so each candidate token is classified by its length alone
+_SECURITY_LENGTHS = {"CUSIP": 9, "ISIN": 12, "SEDOL": 7}
+_SEDOL_CHARS = frozenset("0123456789BCDFGHJKLMNPQRSTVWXYZ")
+_SECURITY_VALIDATORS = {
+    "CUSIP": is_cusip, 
+    "ISIN": is_isin, 
+    "SEDOL": is_sedol
+    }
 
 def get_cusips(s: str) -> List[str]:
     """
@@ -23,9 +45,27 @@ def get_cusips(s: str) -> List[str]:
     ------
         1. 's' -> input string
     """
-    #ensure 9th is digit
-    pattern = r"((?<=[^\w])|(?<=^))([A-Za-z0-9]{8}[0-9])(?=[^\w]|$)"
-    return find_and_validate(s, pattern, validation_fn=is_cusip)
+    return find_and_validate(s, _CUSIP_RE, validation_fn=is_cusip, max_len=9)
+
+def iter_cusips(s: str) -> Iterator[str]:
+    """
+    Lazily yields the CUSIPs found in text. See get_cusips for the CUSIP format.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+    """
+    yield from iter_find_and_validate(s, _CUSIP_RE, validation_fn=is_cusip, max_len=9)
+
+def get_cusips_file(path: str) -> List[str]:
+    """
+    Finds the CUSIPs in a file without reading it into memory. See get_cusips for the CUSIP format.
+    ------
+    PARAMS
+    ------
+        1. 'path' -> path to the file to scan
+    """
+    return find_and_validate_file(path, _CUSIP_RE, validation_fn=is_cusip, max_len=9)
 
 
 def get_isins(s: str) -> List[str]:
@@ -47,8 +87,27 @@ def get_isins(s: str) -> List[str]:
     ------
         1. 's' -> input string
     """
-    pattern = r"((?<=[^\w])|(?<=^))([A-Za-z]{2}[A-Za-z0-9]{9}[0-9])(?=[^\w]|$)"
-    return find_and_validate(s, pattern, validation_fn=is_isin)
+    return find_and_validate(s, _ISIN_RE, validation_fn=is_isin, max_len=12)
+
+def iter_isins(s: str) -> Iterator[str]:
+    """
+    Lazily yields the ISINs found in text. See get_isins for the ISIN format.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+    """
+    yield from iter_find_and_validate(s, _ISIN_RE, validation_fn=is_isin, max_len=12)
+
+def get_isins_file(path: str) -> List[str]:
+    """
+    Finds the ISINs in a file without reading it into memory. See get_isins for the ISIN format.
+    ------
+    PARAMS
+    ------
+        1. 'path' -> path to the file to scan
+    """
+    return find_and_validate_file(path, _ISIN_RE, validation_fn=is_isin, max_len=12)
 
 
 def get_sedols(s: str) -> List[str]:
@@ -66,21 +125,80 @@ def get_sedols(s: str) -> List[str]:
     ------
         1. 's' -> input string
     """
-    pattern = r"((?<=[^\w])|(?<=^))([0-9BCDFGHJKLMNPQRSTVWXYZ]{6}[0-9])(?=[^\w]|$)"
-    return find_and_validate(s, pattern, validation_fn=is_sedol)
+    return find_and_validate(s, _SEDOL_RE, validation_fn=is_sedol, max_len=7)
+
+def iter_sedols(s: str) -> Iterator[str]:
+    """
+    Lazily yields the SEDOLs found in text. See get_sedols for the SEDOL format.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+    """
+    yield from iter_find_and_validate(s, _SEDOL_RE, validation_fn=is_sedol, max_len=7)
+
+def get_sedols_file(path: str) -> List[str]:
+    """
+    Finds the SEDOLs in a file without reading it into memory. See get_sedols for the SEDOL format.
+    ------
+    PARAMS
+    ------
+        1. 'path' -> path to the file to scan
+    """
+    return find_and_validate_file(path, _SEDOL_RE, validation_fn=is_sedol, max_len=7)
+
+@functools.lru_cache(maxsize=8)
+def _security_token_pattern(include: Tuple[str, ...]) -> Pattern:
+    r"""
+    Builds the prefilter pattern for find_securities, matching only words with the lengths of the included types.
+    Any word of alphanumerics ending in a digit is a candidate, e.g. for all types (lengths 7, 9, and 12):
+        \b[A-Za-z0-9]{6}(?:[A-Za-z0-9]{2}(?:[A-Za-z0-9]{3})?)?[0-9]\b
+    ------
+    PARAMS
+    ------
+        1. 'include' -> sorted tuple of identifier types
+    """
+    lengths = sorted({_SECURITY_LENGTHS[t] for t in include})
+    optional = ""
+    for shorter, longer in reversed(list(zip(lengths, lengths[1:]))):
+        optional = f"(?:[A-Za-z0-9]{{{longer - shorter}}}{optional})?"
+    return compile_pattern(rf"\b[A-Za-z0-9]{{{lengths[0] - 1}}}{optional}[0-9]\b")
+
+def _security_type(token: str) -> Optional[str]:
+    """
+    Returns which identifier format a candidate token follows, or None if it follows none
+    """
+    n = len(token)
+    if n == 9:
+        return "CUSIP"
+    if n == 12:
+        return "ISIN" if token[:2].isalpha() else None
+    if n == 7:
+        return "SEDOL" if _SEDOL_CHARS.issuperset(token) else None
+    return None
 
 def find_securities(s: str, include: List = ["CUSIP", "ISIN", "SEDOL"]) -> Dict:
-    allowed_types = {
-        "CUSIP": get_cusips, 
-        "ISIN": get_isins, 
-        "SEDOL": get_sedols
-        }
+    """
+    ---------------------------------------------------
+    Find and Extract CUSIPs, ISINs, and SEDOLs from text
+    ---------------------------------------------------
+    The string is scanned once for candidate tokens of the included types, which are then classified and validated by their type's checksum
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+        2. 'include' -> identifier types to return. Defaults to all of CUSIP, ISIN, and SEDOL
+    """
     include = [x.upper() for x in include] #ensure upper
-    include = [x for x in include if x in allowed_types] #ensure types are valid
+    include = [x for x in include if x in _SECURITY_VALIDATORS] #ensure types are valid
     assert len(include) > 0, "Must include at least one of the following: CUSIP, ISIN, or SEDOL"
-    res = {}
-    for t in include:
-        res[t] = allowed_types[t](s)
+    res = {t: [] for t in include}
+    pattern = _security_token_pattern(tuple(sorted(set(include))))
+    max_len = max(_SECURITY_LENGTHS[t] for t in include)
+    for x in iter_matches(s, pattern, max_len=max_len):
+        t = _security_type(x)
+        if t in res and _SECURITY_VALIDATORS[t](x):
+            res[t].append(x)
     return res
 
 def get_abas(s: str) -> List[str]:
@@ -106,7 +224,26 @@ def get_abas(s: str) -> List[str]:
     ------
         1. 's' -> input string
     """
-    pattern = r"((?<=[^\w])|(?<=^))(\d{9})(?=[^\w]|$)"
-    return find_and_validate(s, pattern, validation_fn=is_aba)
+    return find_and_validate(s, _ABA_RE, validation_fn=is_aba, max_len=9)
+
+def iter_abas(s: str) -> Iterator[str]:
+    """
+    Lazily yields the ABA numbers found in text. See get_abas for the ABA number format.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+    """
+    yield from iter_find_and_validate(s, _ABA_RE, validation_fn=is_aba, max_len=9)
+
+def get_abas_file(path: str) -> List[str]:
+    """
+    Finds the ABA numbers in a file without reading it into memory. See get_abas for the ABA number format.
+    ------
+    PARAMS
+    ------
+        1. 'path' -> path to the file to scan
+    """
+    return find_and_validate_file(path, _ABA_RE, validation_fn=is_aba, max_len=9)
 
 
@@ -1,16 +1,61 @@
-from typing import *
+from typing import Callable, Iterator, List, Optional, Pattern, Tuple, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import functools
+import mmap
+import os
 import pkg_resources
 import re
 
+#the third-party regex module is opt-in, as it scans this package's patterns ~3x slower than the builtin re on ascii text.
+#it is however the only engine that releases the GIL while matching, so long inputs are only scanned in parallel chunks with it
+if os.environ.get("FINCHECK_USE_REGEX", "").strip().lower() in ("1", "true"):
+    try:
+        import regex as re
+    except ImportError:
+        pass
+
+try: #optional linear-time engine used by find_and_validate_re2
+    import re2
+except ImportError:
+    re2 = None
+
+try: #optional JIT compiler for the checksum kernels
+    from numba import njit
+except ImportError:
+    njit = None
+
+#with the regex engine, inputs longer than this are split into chunks of this size and scanned concurrently
+_CHUNK_SIZE = 1 << 16
+
+_NON_DIGITS = re.compile(r"\D+")
+
+#digit value of each character allowed in an identifier, i.e. 0-9 -> 0-9 and A-Z -> 10-35
+_TO_N_INT = {c: i for i, c in enumerate("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ")}
+_TO_N_STR = str.maketrans({c: str(i) for c, i in _TO_N_INT.items()})
+
+def jit(fn: Callable) -> Callable:
+    """
+    Compiles a function with numba when it is installed, otherwise returns it unchanged
+    ------
+    PARAMS
+    ------
+        1. 'fn' -> function to compile. Must only use numba-supported python
+    """
+    if njit is None:
+        return fn
+    return njit(cache=True)(fn)
+
 def keep_numeric(s: str) -> str:
     """
-    Keeps only numeric characters in a string
+    Keeps only decimal digits in a string, e.g. unicode numerics such as "²" are removed
     ------
     PARAMS
     ------
         1. 's' -> input string
     """
-    return "".join(c for c in list(s) if c.isnumeric())
+    return _NON_DIGITS.sub("", s)
 
 def convert_to_n(s: str, return_str: bool = True) -> Union[str, list]:
     """
@@ -21,10 +66,15 @@ def convert_to_n(s: str, return_str: bool = True) -> Union[str, list]:
         1. 's' -> input string
         2. 'return_str' -> If true, returns a string of sequential digits, else returns a list of digits
     """
-    char_idxs = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     if return_str:
-        return "".join(str(char_idxs.index(c)) for c in list(s))
-    return [char_idxs.index(c) for c in list(s)]
+        digits = s.translate(_TO_N_STR)
+        if s and not (digits.isascii() and digits.isdigit()):
+            raise ValueError(f"'{s}' contains characters outside of 0-9 and A-Z.")
+        return digits
+    try:
+        return [_TO_N_INT[c] for c in s]
+    except KeyError:
+        raise ValueError(f"'{s}' contains characters outside of 0-9 and A-Z.") from None
 
 def ensure_format(s: str, n_chars: int = None) -> str:
     """
@@ -51,39 +101,221 @@ def split_payload(s: str) -> Tuple[str, int]:
     ------
         1. 's' -> input string
     """
-    payload = s[:-1]
-    check_digit = int(s[-1])
-    return payload, check_digit
+    check_digit = ord(s[-1]) - 48 #ascii digit, without the overhead of int()
+    if not 0 <= check_digit <= 9:
+        check_digit = int(s[-1]) #non-ascii digits, or raises ValueError as before
+    return s[:-1], check_digit
 
-def find_and_validate(s: str, pattern: str, validation_fn: Callable = None) -> List:
+@functools.lru_cache(maxsize=64)
+def compile_pattern(pattern: str) -> Pattern:
     """
-    Searches a string and returns every match of a regex pattern. 
+    Compiles a regex pattern, caching the result so a pattern string is only compiled once
+    ------
+    PARAMS
+    ------
+        1. 'pattern' -> regex pattern string
+    """
+    return re.compile(pattern)
+
+def _can_scan_concurrently(pattern: Pattern) -> bool:
+    """
+    The regex module releases the GIL while matching, the builtin re module does not
+    """
+    return re.__name__ == "regex" and isinstance(pattern, re.Pattern)
+
+def _parallel_find(s: str, pattern: Pattern, group: int = 0, overlap: int = 13, chunk_size: int = _CHUNK_SIZE) -> Iterator[str]:
+    """
+    Scans a string for a regex pattern in overlapping chunks across threads, and lazily yields the text of the matches in order.
+    Each worker scans its own range of 's' in place via pos/endpos, so no window is copied out of it, 
+    and only a bounded number of chunks are in flight at once.
+    A match is kept only by the chunk it starts in, so boundary matches are not duplicated.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string, or bytes-like object for a bytes pattern
+        2. 'pattern' -> compiled regex pattern. Must be anchored on word boundaries.
+        3. 'group' -> group of each match to yield. Defaults to the whole match
+        4. 'overlap' -> num characters each chunk's scan extends past its end. Must exceed the longest possible match.
+        5. 'chunk_size' -> num characters scanned per chunk
+    """
+    kwargs = {"concurrent": True} if _can_scan_concurrently(pattern) else {}
+    workers = os.cpu_count() or 1
+
+    def scan(start: int) -> List[str]:
+        end = start + chunk_size
+        return [m.group(group) for m in pattern.finditer(s, start, end + overlap, **kwargs) if m.start() < end]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start in range(0, len(s), chunk_size):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(scan, start))
+        while pending:
+            yield from pending.popleft().result()
+
+def can_scan_as_bytes(s: str, pattern: Pattern) -> bool:
+    """
+    Whether a string can be scanned as ascii bytes instead, which the builtin re engine matches faster than str.
+    The regex module gains nothing from it, and non-ascii strings would lose their unicode word boundaries.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+        2. 'pattern' -> compiled regex pattern
+    """
+    return re.__name__ == "re" and isinstance(s, str) and s.isascii() and isinstance(pattern.pattern, str)
+
+@functools.lru_cache(maxsize=64)
+def to_bytes_pattern(pattern: Pattern) -> Optional[Pattern]:
+    r"""
+    Compiles the bytes equivalent of a str pattern, or returns None if the pattern is not ascii
+    or uses str-only escapes such as \N{...} and \u
+    """
+    if not pattern.pattern.isascii():
+        return None
+    try:
+        return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+    except re.error:
+        return None
+
+def iter_matches(s: str, pattern: Union[str, Pattern], max_len: int = None) -> Iterator[str]:
+    """
+    Lazily yields the text of every match of a regex pattern. 
+    If the pattern has a capturing group, the first group is yielded rather than the whole match.
+    Ascii strings are scanned as bytes where that is faster, and bytes matches are always decoded back to str.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string, or bytes-like object if 'pattern' is a bytes pattern
+        2. 'pattern' -> regex pattern to search for. Either a pattern string or a compiled pattern
+        3. 'max_len' -> longest possible match of a word-bounded pattern. Defaults to None
+                        - If specified, long inputs are scanned in parallel chunks when the regex engine is enabled
+    """
+    if isinstance(pattern, str):
+        pattern = compile_pattern(pattern)
+    group = 1 if pattern.groups else 0
+    bytes_pattern = to_bytes_pattern(pattern) if can_scan_as_bytes(s, pattern) else None
+    if bytes_pattern:
+        s, pattern = s.encode("ascii"), bytes_pattern
+    if max_len and len(s) > _CHUNK_SIZE and _can_scan_concurrently(pattern):
+        matches = _parallel_find(s, pattern, group=group, overlap=max_len + 1)
+    else:
+        matches = (m.group(group) for m in pattern.finditer(s))
+    if isinstance(pattern.pattern, bytes):
+        return (m.decode("ascii") for m in matches)
+    return matches
+
+def iter_find_and_validate(s: str, pattern: Union[str, Pattern], validation_fn: Callable = None, max_len: int = None) -> Iterator[str]:
+    """
+    Searches a string and lazily yields every match of a regex pattern. 
+    If the pattern has a capturing group, the first group is yielded rather than the whole match.
     If validation_fn is specified, the matches are kept only if the function's criteria are met.
     ------
     PARAMS
     ------
         1. 's' -> input string
-        2. 'pattern' -> regex pattern to search for
+        2. 'pattern' -> regex pattern to search for. Either a pattern string or a compiled pattern
+        3. 'validation_fn' -> function to call to validate matches. Defaults to None
+                              - Note this function should return a boolean
+        4. 'max_len' -> longest possible match of a word-bounded pattern. Defaults to None
+                        - If specified, long inputs are scanned in parallel chunks when the regex engine is enabled
+    """
+    matches = iter_matches(s, pattern, max_len=max_len)
+    if validation_fn:
+        matches = (m for m in matches if validation_fn(m))
+    yield from matches
+
+def find_and_validate(s: str, pattern: Union[str, Pattern], validation_fn: Callable = None, max_len: int = None) -> List:
+    """
+    Searches a string and returns every match of a regex pattern. 
+    Same as iter_find_and_validate, but returns a list.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string
+        2. 'pattern' -> regex pattern to search for. Either a pattern string or a compiled pattern
         3. 'validation_fn' -> function to call to validate matches. Defaults to None
                               - Note this function should return a boolean
+        4. 'max_len' -> longest possible match of a word-bounded pattern. Defaults to None
+                        - If specified, long inputs are scanned in parallel chunks when the regex engine is enabled
     """
-    matches = [m for m in re.finditer(pattern, s)]
-    if matches:
-        matches = [m.group(0) for m in matches]
-        if validation_fn:
-            matches = [m for m in matches if validation_fn(m)]
+    return list(iter_find_and_validate(s, pattern, validation_fn=validation_fn, max_len=max_len))
+
+def find_and_validate_file(path: str, pattern: Union[str, Pattern], validation_fn: Callable = None, max_len: int = None) -> List:
+    """
+    Same as find_and_validate, but scans a file without reading it into memory.
+    The file is memory-mapped and scanned with the bytes equivalent of the pattern, so word boundaries only consider ascii characters.
+    Parallel chunks each scan their own range of the map in place, so the file is never copied into memory.
+    ------
+    PARAMS
+    ------
+        1. 'path' -> path to the file to scan
+        2. 'pattern' -> regex pattern to search for. Either a pattern string or a compiled pattern, and must be ascii
+        3. 'validation_fn' -> function to call to validate matches. Defaults to None
+                              - Note this function should return a boolean
+        4. 'max_len' -> longest possible match of a word-bounded pattern. Defaults to None
+                        - If specified, large files are scanned in parallel chunks when the regex engine is enabled
+    """
+    if isinstance(pattern, str):
+        pattern = compile_pattern(pattern)
+    if isinstance(pattern.pattern, str):
+        pattern = to_bytes_pattern(pattern)
+        assert pattern is not None, "Pattern must be ascii to scan a file."
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0: #empty files cannot be mapped
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            #the matches are fully consumed before the map is closed, as pending chunks still scan it
+            matches = list(iter_matches(mm, pattern, max_len=max_len))
+    if validation_fn:
+        return [m for m in matches if validation_fn(m)]
     return matches
 
+@functools.lru_cache(maxsize=64)
+def compile_pattern_re2(pattern: Union[str, bytes]):
+    """
+    Compiles a regex pattern with Google's RE2 engine, caching the result
+    ------
+    PARAMS
+    ------
+        1. 'pattern' -> regex pattern string or bytes. Must not contain lookarounds or backreferences.
+    """
+    if re2 is None:
+        raise ImportError("find_and_validate_re2 requires the 'google-re2' (or 'pyre2') package.")
+    return re2.compile(pattern)
+
+def find_and_validate_re2(s: Union[str, bytes], pattern: Union[str, bytes], validation_fn: Callable = None) -> List:
+    """
+    Searches with RE2, which guarantees linear time on large inputs, and returns every match of a regex pattern.
+    Bytes matches are decoded to ascii str before validation, so the fincheck validators can be used on either input.
+    Note RE2's word boundaries only consider ascii characters, unlike find_and_validate on str input,
+    e.g. 'é037833100' yields '037833100' here while get_cusips finds nothing.
+    ------
+    PARAMS
+    ------
+        1. 's' -> input string or bytes
+        2. 'pattern' -> regex pattern to search for. Must be of the same type as 's'
+        3. 'validation_fn' -> function to call to validate matches. Defaults to None
+                              - Note this function should return a boolean
+    """
+    pattern = compile_pattern_re2(pattern)
+    group = 1 if pattern.groups else 0
+    matches = (m.group(group) for m in pattern.finditer(s))
+    if isinstance(s, (bytes, bytearray)):
+        matches = (m.decode("ascii") for m in matches)
+    if validation_fn:
+        return [m for m in matches if validation_fn(m)]
+    return list(matches)
+
 def read_csv(path: str, keep_headers: bool = False) -> List:
     """
-    Reads a csv file by splitting by "\n" and then "," -- creating a 2d list
+    Reads a csv file row by row with the csv module -- creating a 2d list
     """
     path = pkg_resources.resource_filename(__name__, path)
-    with open(path, "r") as f:
-        data = f.read()
-    data = data.split("\n")
-    if not keep_headers:
-        data = data[1:]
-    data = [x.split(",") for x in data]
-    return data
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        if not keep_headers:
+            next(reader, None)
+        return list(reader)
 
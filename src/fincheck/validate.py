@@ -1,6 +1,8 @@
 from typing import *
+import functools
 from .utils import split_payload
 from .checksum import luhn_check_digit, isin_check_digit, cusip_check_digit, sedol_check_digit
+from .checksum import isin_check_digit_ascii, cusip_check_digit_ascii
 
 def is_luhn(s: str) -> bool:
     """
@@ -13,6 +15,7 @@ def is_luhn(s: str) -> bool:
     payload, check_digit = split_payload(s)
     return luhn_check_digit(payload) == check_digit
 
+@functools.lru_cache(maxsize=4096) #text often repeats the same identifier
 def is_isin(s: str) -> bool:
     """
     Validates if a string follows the ISIN checksum algorithm and ISIN format
@@ -25,11 +28,16 @@ def is_isin(s: str) -> bool:
     #ISINs are 12 characters long. First two chars are alpha (country code). Last is numerical (check digit)
     if len(s) == 12 and s[:2].isalpha() and s[-1].isnumeric():   
         payload, check_digit = split_payload(s)
-        return isin_check_digit(payload) == check_digit
+        if payload.isascii():
+            digit = isin_check_digit_ascii(payload.encode("ascii"))
+            if digit >= 0:
+                return digit == check_digit
+        return isin_check_digit(payload) == check_digit #raises on invalid characters
     return False
 
 
 
+@functools.lru_cache(maxsize=4096)
 def is_cusip(s: str) -> bool:
     """
     Validates if a string follows the CUSIP check digit algorithm and CUSIP format
@@ -41,9 +49,14 @@ def is_cusip(s: str) -> bool:
     s = s.replace(" ", "")
     if len(s) == 9 and s[-1].isnumeric(): #cusips are 9 characters long and last digit is numerical (Check digit)
         payload, check_digit = split_payload(s)
-        return cusip_check_digit(payload) == check_digit
+        if payload.isascii():
+            digit = cusip_check_digit_ascii(payload.encode("ascii"))
+            if digit >= 0:
+                return digit == check_digit
+        return cusip_check_digit(payload) == check_digit #raises on invalid characters
     return False
 
+@functools.lru_cache(maxsize=4096)
 def is_sedol(s: str) -> bool:
     """
     Determines whether a string follows the SEDOL check digit algorithm and SEDOL format
@@ -59,6 +72,7 @@ def is_sedol(s: str) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=4096)
 def is_aba(s: str) -> bool:
     """
     Determines whether a sequence of characters is an ABA Number
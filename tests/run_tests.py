@@ -3,6 +3,7 @@ import fincheck
 from os import listdir
 import re
 from ast import literal_eval
+import mmap
 
 def txt2list(path: str) -> List:
     """
@@ -16,6 +17,16 @@ def run_validation_test(data: List, answers: List, validation_fn: Callable):
     for x, y in list(zip(data, answers)):
         assert str(validation_fn(x)) == y
 
+def run_file_extraction_test(path: str, answers: str):
+    parsing_dict = {
+        "ABA": fincheck.extract.get_abas_file,
+        "CUSIP": fincheck.extract.get_cusips_file,
+        "ISIN": fincheck.extract.get_isins_file,
+        "SEDOL": fincheck.extract.get_sedols_file
+    }
+    for k, v in parsing_dict.items():
+        assert answers[k] == v(path)
+
 def run_extraction_test(s: str, answers: str):
     parsing_dict = {
         "ABA": fincheck.extract.get_abas,
@@ -23,8 +34,18 @@ def run_extraction_test(s: str, answers: str):
         "ISIN": fincheck.extract.get_isins,
         "SEDOL": fincheck.extract.get_sedols
     }
+    iter_dict = {
+        "ABA": fincheck.extract.iter_abas,
+        "CUSIP": fincheck.extract.iter_cusips,
+        "ISIN": fincheck.extract.iter_isins,
+        "SEDOL": fincheck.extract.iter_sedols
+    }
     for k, v in parsing_dict.items():
         assert answers[k] == v(s)
+        assert answers[k] == list(iter_dict[k](s))
+    securities = fincheck.extract.find_securities(s)
+    for k, v in securities.items():
+        assert answers[k] == v
 
 def test_cusips():
     data = txt2list("Data/cusips.txt")
@@ -58,6 +79,66 @@ def test_extraction():
             with open(f"Data/extraction/{answers_template.format(m.group(1))}") as f:
                 y = literal_eval(f.read())
             run_extraction_test(x, y)
+            run_extraction_test(x.encode("ascii", "replace").decode("ascii"), y) #ascii-only text is scanned as bytes
+            run_file_extraction_test(f"Data/extraction/{template.format(m.group(1))}", y)
+
+def test_str_only_escapes():
+    #ascii input is scanned as bytes, but patterns with str-only escapes must still work
+    for pattern in [r"\N{LATIN CAPITAL LETTER A}", r"\u0041", r"\U00000041"]:
+        assert fincheck.utils.find_and_validate("xAy", pattern) == ["A"]
+
+def test_parallel_extraction():
+    files = [f"Data/extraction/{fi}" for fi in sorted(listdir("Data/extraction")) if "answers" not in fi]
+    x = ""
+    for fi in files:
+        with open(fi) as f:
+            x += f.read() + "\n"
+    patterns = [
+        fincheck.extract._CUSIP_RE, 
+        fincheck.extract._ISIN_RE, 
+        fincheck.extract._SEDOL_RE, 
+        fincheck.extract._ABA_RE
+        ]
+    for pattern in patterns:
+        expected = fincheck.utils.find_and_validate(x, pattern)
+        for chunk_size in [13, 50, 997]: #small chunks so many matches straddle chunk boundaries
+            assert list(fincheck.utils._parallel_find(x, pattern, group=1, chunk_size=chunk_size)) == expected
+    with open(files[0], "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: #files are scanned as bytes in place
+        for pattern in patterns:
+            expected = fincheck.utils.find_and_validate_file(files[0], pattern)
+            bytes_pattern = fincheck.utils.to_bytes_pattern(pattern)
+            for chunk_size in [13, 50, 997]:
+                matches = fincheck.utils._parallel_find(mm, bytes_pattern, group=1, chunk_size=chunk_size)
+                assert [m.decode("ascii") for m in matches] == expected
+    s = ("x " * 40000) + " 037833100" #long enough to be scanned in chunks when enabled
+    assert list(fincheck.utils.iter_matches(s, fincheck.extract._CUSIP_RE, max_len=9)) == ["037833100"]
+    assert fincheck.extract.find_securities(s)["CUSIP"] == ["037833100"]
+
+def test_re2_extraction():
+    if fincheck.utils.re2 is None: #skipped without google-re2
+        return
+    patterns = {
+        fincheck.extract._CUSIP_PATTERN: fincheck.validate.is_cusip,
+        fincheck.extract._ISIN_PATTERN: fincheck.validate.is_isin,
+        fincheck.extract._SEDOL_PATTERN: fincheck.validate.is_sedol,
+        fincheck.extract._ABA_PATTERN: fincheck.validate.is_aba
+    }
+    s = "M0392N101 M0392N100 US9129091081 122235821 2007849"
+    for pattern, fn in patterns.items():
+        expected = fincheck.utils.find_and_validate(s, pattern, validation_fn=fn)
+        assert fincheck.utils.find_and_validate_re2(s, pattern, validation_fn=fn) == expected
+        assert fincheck.utils.find_and_validate_re2(s.encode("ascii"), pattern.encode("ascii"), validation_fn=fn) == expected
+    #RE2 word boundaries are ascii-only
+    assert fincheck.utils.find_and_validate_re2("\u00e9037833100", fincheck.extract._CUSIP_PATTERN) == ["037833100"]
+    assert fincheck.extract.get_cusips("\u00e9037833100") == []
+
+def test_refdata():
+    #quoted fields keep their commas, and CRLF line endings do not leak into the last field
+    codes = fincheck.data.load_isin_country_codes()
+    assert ["KR", "KOREA, REPUBLIC OF"] in codes
+    assert all(len(row) == 2 for row in codes)
+    for data in [codes, fincheck.data.load_cusip_ticker_map(), fincheck.data.load_cusip_refdata()]:
+        assert not any(x.endswith("\r") for row in data for x in row)
 
 def test_check_digits():
     files = ["Data/cusips.txt", "Data/isins.txt", "Data/sedols.txt"]
@@ -74,6 +155,17 @@ def test_check_digits():
             if a == "True":
                 assert fn(d[:-1]) == int(d[-1])
 
+def test_ascii_check_digits():
+    files = ["Data/cusips.txt", "Data/isins.txt"]
+    test_fns = [fincheck.checksum.cusip_check_digit_ascii, fincheck.checksum.isin_check_digit_ascii]
+    for fi, fn in list(zip(files, test_fns)):
+        data = txt2list(fi)
+        ans = txt2list(fi.replace(".txt", "_answers.txt"))
+        for d, a in list(zip(data, ans)):
+            if a == "True":
+                assert fn(d[:-1].encode("ascii")) == int(d[-1])
+    assert fincheck.checksum.cusip_check_digit_ascii(b"30303m10") == -1
+
 if __name__ == "__main__":
     print("Running tests...")
     test_cusips()
@@ -82,8 +174,14 @@ if __name__ == "__main__":
     test_abas()
     print("Validation: PASSED")
     test_extraction()
+    test_str_only_escapes()
+    test_parallel_extraction()
+    test_re2_extraction()
     print("Extraction: PASSED")
     test_check_digits()
+    test_ascii_check_digits()
     print("Check Digits: PASSED")
+    test_refdata()
+    print("Reference Data: PASSED")
     print("PASSED ALL TESTS.")
     